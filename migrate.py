@@ -6,38 +6,112 @@ Extracts blog posts and pages from WordPress HTML export and creates Hugo conten
 Preserves HTML content without converting to Markdown for maximum compatibility.
 """
 
+import functools
 import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import html
-from bs4 import BeautifulSoup
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
 
+# Only these tags are ever consumed, so skip building wrapper objects
+# for everything else in the document
+POST_STRAINER = SoupStrainer(['article', 'div', 'h1', 'title', 'time'])
+PAGE_STRAINER = SoupStrainer(['article', 'div', 'h1', 'title', 'time', 'main'])
 
-def clean_slug(path_parts):
-    """Create a clean slug from URL path parts"""
-    return path_parts[-2] if len(path_parts) > 1 else 'index'
+# Files are read as bytes, so pin the decode to UTF-8 rather than letting
+# libxml2 guess the encoding of files with no charset declaration
+_LXML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
 
+# Compiled once so the hot per-file paths skip re's pattern-cache lookup
+_YEARMONTH_RE = re.compile(r'/(\d{4})/(\d{2})/')
+_YEAR_DIR_RE = re.compile(r'\d{4}')
 
-def extract_post_metadata(soup, file_path):
+# Parent directories already created, so repeat mkdir syscalls are skipped
+_CREATED_DIRS = set()
+
+
+def _iter_post_indexes(root):
+    """Yield YYYY/MM/slug/index.html paths under root
+
+    Descends only year/month/slug directories, skipping the assets and
+    wp-content subtrees that a full recursive glob would stat.
+    """
+    with os.scandir(root) as years:
+        for year in years:
+            if not year.is_dir() or not _YEAR_DIR_RE.match(year.name):
+                continue
+            with os.scandir(year.path) as months:
+                for month in months:
+                    if not month.is_dir():
+                        continue
+                    with os.scandir(month.path) as slugs:
+                        for slug in slugs:
+                            if not slug.is_dir():
+                                continue
+                            index = os.path.join(slug.path, 'index.html')
+                            if os.path.isfile(index):
+                                yield Path(index)
+
+
+def _year_month_from_path(path):
+    """Extract (year, month) from a YYYY/MM/slug/index.html path, or (None, None)"""
+    parts = path.parts
+    if len(parts) >= 4:
+        year, month = parts[-4], parts[-3]
+        if len(year) == 4 and year.isdigit() and len(month) == 2 and month.isdigit():
+            return year, month
+    # Fall back to the regex for non-standard layouts
+    match = _YEARMONTH_RE.search(str(path))
+    if match:
+        return match.group(1), match.group(2)
+    return None, None
+
+
+def clean_slug(path):
+    """Create a clean slug from a file path"""
+    parts = path.parts
+    return parts[-2] if len(parts) > 1 else 'index'
+
+
+def extract_post_metadata(soup, file_path, year_month=None):
     """Extract metadata from WordPress HTML"""
     metadata = {}
-    
+
+    # Collect all elements of interest in a single document traversal
+    # rather than one full find() pass per element
+    title_elem = None
+    page_title_elem = None
+    date_elem = None
+    article_elem = None
+    for elem in soup.descendants:
+        name = getattr(elem, 'name', None)
+        if not name:
+            continue
+        if name == 'h1' and title_elem is None and 'entry-title' in (elem.get('class') or []):
+            title_elem = elem
+        elif name == 'title' and page_title_elem is None:
+            page_title_elem = elem
+        elif name == 'time' and date_elem is None and 'entry-date' in (elem.get('class') or []):
+            date_elem = elem
+        elif name == 'article' and article_elem is None:
+            article_elem = elem
+        if title_elem and date_elem and article_elem:
+            break
+
     # Extract title
-    title_elem = soup.find('h1', class_='entry-title')
     if title_elem:
         metadata['title'] = title_elem.get_text().strip()
-    else:
+    elif page_title_elem:
         # Fallback to page title
-        title_elem = soup.find('title')
-        if title_elem:
-            metadata['title'] = title_elem.get_text().replace(' – Adam Wulf', '').strip()
-        else:
-            metadata['title'] = 'Untitled'
-    
+        metadata['title'] = page_title_elem.get_text().replace(' – Adam Wulf', '').strip()
+    else:
+        metadata['title'] = 'Untitled'
+
     # Extract date from time element
-    date_elem = soup.find('time', class_='entry-date')
     if date_elem:
         date_str = date_elem.get('datetime')
         if date_str:
@@ -52,138 +126,145 @@ def extract_post_metadata(soup, file_path):
             metadata['date'] = date_elem.get_text().strip()
     else:
         # Try to extract date from URL path
-        path_parts = str(file_path).split('/')
-        year_pattern = re.search(r'/(\d{4})/', str(file_path))
-        month_pattern = re.search(r'/(\d{4})/(\d{2})/', str(file_path))
-        if year_pattern and month_pattern:
-            year = year_pattern.group(1)
-            month = month_pattern.group(1)
+        if year_month is None:
+            year_month = _year_month_from_path(file_path)
+        year, month = year_month
+        if year and month:
             metadata['date'] = f'{year}-{month}-01T00:00:00+00:00'
         else:
             metadata['date'] = '2008-01-01T00:00:00+00:00'  # Default fallback
     
     # Extract categories and tags
-    article_elem = soup.find('article')
     if article_elem:
         classes = article_elem.get('class', [])
-        categories = []
-        tags = []
-        for cls in classes:
-            if cls.startswith('category-') and cls != 'category-uncategorized':
-                categories.append(cls.replace('category-', '').replace('-', ' ').title())
-            elif cls.startswith('tag-'):
-                tags.append(cls.replace('tag-', '').replace('-', ' ').title())
-        
+        categories = [
+            cls.removeprefix('category-').replace('-', ' ').title()
+            for cls in classes
+            if cls.startswith('category-') and cls != 'category-uncategorized'
+        ]
+        tags = [
+            cls.removeprefix('tag-').replace('-', ' ').title()
+            for cls in classes
+            if cls.startswith('tag-')
+        ]
+
         if categories:
             metadata['categories'] = categories
         if tags:
             metadata['tags'] = tags
     
     # Generate slug from file path
-    path_parts = str(file_path).split('/')
-    metadata['slug'] = clean_slug(path_parts)
+    metadata['slug'] = clean_slug(file_path)
     
     return metadata
 
 
-def extract_post_content(soup):
+def extract_post_content(html_content):
     """Extract the main content from WordPress HTML"""
-    content_elem = soup.find('div', class_='entry-content')
-    if content_elem:
-        # Remove WordPress-specific elements we don't want
-        for elem in content_elem.find_all(['script', 'noscript']):
-            elem.decompose()
-        
-        # Get the HTML content
-        content_html = str(content_elem)
-        
-        # Clean up the content div wrapper
-        content_html = re.sub(r'^<div[^>]*class="entry-content"[^>]*>', '', content_html)
-        content_html = re.sub(r'</div>$', '', content_html.rstrip())
-        
-        return content_html.strip()
-    
-    return ''
+    tree = lxml.html.fromstring(html_content, parser=_LXML_PARSER)
+    matches = tree.xpath('.//div[contains(concat(" ", normalize-space(@class), " "), " entry-content ")]')
+    if not matches:
+        return ''
+    content_elem = matches[0]
+
+    # Remove WordPress-specific elements we don't want
+    for elem in list(content_elem.iter('script', 'noscript')):
+        elem.drop_tree()
+
+    # Serialize only the div's children so there's no wrapper to strip
+    content_html = (content_elem.text or '') + ''.join(
+        lxml.html.tostring(child, encoding='unicode') for child in content_elem
+    )
+
+    return content_html.strip()
+
+
+def _toml_escape(value):
+    """Escape a string for use inside a double-quoted TOML value"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
 
 
 def create_hugo_content_file(metadata, content, output_path):
     """Create a Hugo content file with front matter and HTML content"""
     
-    # Create directory if it doesn't exist
-    os.makedirs(output_path.parent, exist_ok=True)
+    # Create directory if it doesn't exist; thousands of posts share a
+    # handful of year/month directories
+    parent = output_path.parent
+    if parent not in _CREATED_DIRS:
+        parent.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(parent)
     
     # Create front matter
     front_matter = ['+++']
-    front_matter.append(f'title = "{metadata.get("title", "").replace('"', '\\"')}"')
-    front_matter.append(f'date = "{metadata.get("date", "")}"')
-    front_matter.append(f'slug = "{metadata.get("slug", "")}"')
+    front_matter.append(f'title = "{_toml_escape(metadata.get("title", ""))}"')
+    front_matter.append(f'date = "{_toml_escape(metadata.get("date", ""))}"')
+    front_matter.append(f'slug = "{_toml_escape(metadata.get("slug", ""))}"')
     
     if 'categories' in metadata:
-        categories_str = ', '.join(f'"{cat}"' for cat in metadata['categories'])
+        categories_str = ', '.join(f'"{_toml_escape(cat)}"' for cat in metadata['categories'])
         front_matter.append(f'categories = [{categories_str}]')
     
     if 'tags' in metadata:
-        tags_str = ', '.join(f'"{tag}"' for tag in metadata['tags'])
+        tags_str = ', '.join(f'"{_toml_escape(tag)}"' for tag in metadata['tags'])
         front_matter.append(f'tags = [{tags_str}]')
     
     front_matter.append('type = "post"')
     front_matter.append('+++')
     
-    # Write the file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(front_matter))
-        f.write('\n\n')
-        f.write(content)
+    # Write the file in a single call
+    payload = '\n'.join(front_matter) + '\n\n' + content
+    output_path.write_text(payload, encoding='utf-8')
 
 
-def process_blog_post(html_file, hugo_content_dir):
-    """Process a single blog post HTML file"""
-    
-    with open(html_file, 'r', encoding='utf-8') as f:
+def _migrate_one(html_file, hugo_content_dir):
+    """Process a single blog post HTML file
+
+    Returns the Hugo output path on success, or None if the file was skipped.
+    """
+
+    # Read bytes and let lxml handle decoding, skipping a Python-level
+    # UTF-8 decode pass over every file
+    with open(html_file, 'rb') as f:
         html_content = f.read()
-    
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
+
+    soup = BeautifulSoup(html_content, 'lxml', parse_only=POST_STRAINER, from_encoding='utf-8')
+
     # Skip if this doesn't look like a blog post
     if not soup.find('article') or not soup.find('div', class_='entry-content'):
-        return False
-    
+        return None
+
+    # Extract year, month, and slug from path
+    year, month = year_month = _year_month_from_path(html_file)
+
     # Extract metadata and content
-    metadata = extract_post_metadata(soup, html_file)
-    content = extract_post_content(soup)
-    
+    metadata = extract_post_metadata(soup, html_file, year_month)
+    content = extract_post_content(html_content)
+
     if not content.strip():
         print(f"Warning: No content found in {html_file}")
-        return False
-    
-    # Extract year, month, and slug from path
-    year_match = re.search(r'/(\d{4})/', str(html_file))
-    month_match = re.search(r'/(\d{4})/(\d{2})/', str(html_file))
-    
-    if year_match and month_match:
-        year = year_match.group(1)
-        month = month_match.group(1)
+        return None
+
+    if year and month:
         slug = metadata['slug']
-        
+
         # Create Hugo content path: content/posts/YYYY/MM/slug.html
         output_path = hugo_content_dir / 'posts' / year / month / f'{slug}.html'
     else:
         # Fallback for non-dated content
         output_path = hugo_content_dir / 'posts' / f'{metadata["slug"]}.html'
-    
+
     create_hugo_content_file(metadata, content, output_path)
-    print(f"Migrated: {html_file} -> {output_path}")
-    return True
+    return output_path
 
 
 def process_static_page(html_file, hugo_content_dir):
     """Process a static page (about, projects, etc.)"""
     
-    with open(html_file, 'r', encoding='utf-8') as f:
+    with open(html_file, 'rb') as f:
         html_content = f.read()
-    
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
+
+    soup = BeautifulSoup(html_content, 'lxml', parse_only=PAGE_STRAINER, from_encoding='utf-8')
+
     # Extract page content - look for main content area
     content_elem = soup.find('div', class_='entry-content') or soup.find('main') or soup.find('div', class_='site-content')
     if not content_elem:
@@ -192,14 +273,14 @@ def process_static_page(html_file, hugo_content_dir):
     
     # Extract metadata
     metadata = extract_post_metadata(soup, html_file)
-    content = extract_post_content(soup) or str(content_elem)
+    content = extract_post_content(html_content) or content_elem.decode_contents().strip()
     
     # Clean up content if we got the full site-content div
     if 'site-content' in str(content_elem.get('class', [])):
         # Find the actual content within site-content
         inner_content = content_elem.find('div', class_='entry-content') or content_elem.find('main')
         if inner_content:
-            content = str(inner_content)
+            content = inner_content.decode_contents().strip()
     
     # Determine page name from file path
     page_name = os.path.basename(os.path.dirname(html_file))
@@ -234,18 +315,22 @@ def main():
     
     # Process blog posts
     print("Processing blog posts...")
+
+    # Find all blog post HTML files (in year/month/title structure)
+    post_files = list(_iter_post_indexes(wp_dir))
+
+    # Each file is fully independent, so fan out across cores
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(
+            functools.partial(_migrate_one, hugo_content_dir=hugo_content_dir),
+            post_files, chunksize=16))
+
     post_count = 0
-    
-    # Find all blog post HTML files (in year/month/day or year/month/title structure)
-    for html_file in wp_dir.glob('**/index.html'):
-        # Skip root index and pagination
-        if str(html_file).endswith('/index.html'):
-            path_parts = str(html_file).split('/')
-            # Look for year/month/slug/index.html pattern
-            if len(path_parts) >= 4 and re.match(r'\d{4}', path_parts[-4]):
-                if process_blog_post(html_file, hugo_content_dir):
-                    post_count += 1
-    
+    for html_file, output_path in zip(post_files, results):
+        if output_path:
+            print(f"Migrated: {html_file} -> {output_path}")
+            post_count += 1
+
     print(f"Migrated {post_count} blog posts")
     
     # Process static pages